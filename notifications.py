@@ -1,37 +1,123 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
-from shapely.geometry import Point, Polygon
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-import requests
 import os
 from dotenv import load_dotenv
 from datetime import datetime
 import json
+import logging
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import time
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Initialize Firebase (if not already initialized)
-try:
-    firebase_admin.get_app()
-except ValueError:
-    cred = credentials.Certificate("/workspaces/urbanTrustApi/serviceAccountKey.json")
-    firebase_admin.initialize_app(cred)
+# Email configuration, read once at import time
+EMAIL_SENDER = os.getenv("EMAIL_SENDER")
+EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
+SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+
+# firebase_admin, shapely and numpy are heavy to import, so they are imported
+# on first use rather than at module load to keep cold starts fast
+_db = None
+
+def get_db():
+    """Return the Firestore client, initializing Firebase on first use"""
+    global _db
+    if _db is None:
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+        
+        # Initialize Firebase (if not already initialized)
+        try:
+            firebase_admin.get_app()
+        except ValueError:
+            cred = credentials.Certificate("/workspaces/urbanTrustApi/serviceAccountKey.json")
+            firebase_admin.initialize_app(cred)
+        
+        _db = firestore.client()
+    return _db
+
+# Document listing every ward ID, so wards can be batch-fetched by ID
+WARD_INDEX_COLLECTION = 'metadata'
+WARD_INDEX_DOCUMENT = 'ward_index'
+
+# Ward boundaries are stored as packed arrays of this dtype in the
+# 'boundaries_x' (longitudes) and 'boundaries_y' (latitudes) fields
+BOUNDARY_DTYPE = 'float64'
 
-db = firestore.client()
+# HTML body of the ward officer notification email
+_EMAIL_TEMPLATE = """
+<html>
+<body>
+    <h2>New Issue Reported in Your Ward</h2>
+    <p><strong>Ward:</strong> {ward_name} (ID: {ward_id})</p>
+    <p><strong>Category:</strong> {category}</p>
+    <p><strong>Description:</strong> {description}</p>
+    <p><strong>Location:</strong> {latitude}, {longitude}</p>
+    <p><strong>Reported on:</strong> {created_at}</p>
+    <p><strong>Issue ID:</strong> {issue_id}</p>
+    <p>Please check the admin dashboard for more details.</p>
+</body>
+</html>
+"""
 
 class WardNotificationSystem:
+    # Wards are essentially static config, so cache them for 15 minutes
+    WARD_TTL = 900
+    # Upper bound on how many grid cells one ward spans along each axis
+    WARD_GRID_MAX_SPAN = 64
+    # Recycle the SMTP session after this many messages
+    SMTP_MAX_MESSAGES = 100
+    # Seconds to wait on the SMTP socket before giving up on a send
+    SMTP_TIMEOUT = 30
+    # Background threads sending notifications, each with its own SMTP session
+    NOTIFICATION_WORKERS = 4
+
     def __init__(self):
         """Initialize the Ward Notification System"""
-        self.db = db
+        self.db = get_db()
+
+        # In-memory ward cache, rebuilt by a snapshot listener whenever the
+        # ward collection changes. WARD_TTL still forces a refetch as a
+        # backstop, since a listener that hits a stream error stops silently.
+        self._ward_cache = None
+        self._ward_cache_ts = 0
+        # Grid of cached wards built by _build_ward_grid
+        self._ward_grid = None
+        # Guards installing a new cache; the generation is bumped on every
+        # install so a slow fetch cannot overwrite a newer snapshot
+        self._ward_lock = threading.Lock()
+        self._ward_generation = 0
+        # Ward IDs last seen in (or written to) the ward index, None if unknown
+        self._ward_index_ids = None
+        try:
+            self._ward_watch = self.db.collection('ward').on_snapshot(self._on_wards_changed)
+        except Exception as e:
+            logger.warning("Could not watch ward collection, falling back to TTL cache: %s", e)
+            self._ward_watch = None
         
         # Email configuration
-        self.email_sender = os.getenv("EMAIL_SENDER")
-        self.email_password = os.getenv("EMAIL_PASSWORD")
-        self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-        self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
+        self.email_sender = EMAIL_SENDER
+        self.email_password = EMAIL_PASSWORD
+        self.smtp_server = SMTP_SERVER
+        self.smtp_port = SMTP_PORT
+
+        # Persistent SMTP session per worker thread, so concurrent sends do
+        # not queue on one connection. _smtp_sessions tracks every open
+        # session (guarded by _smtp_lock) so close() can shut them all down.
+        self._smtp_local = threading.local()
+        self._smtp_sessions = set()
+        self._smtp_lock = threading.Lock()
+
+        # Background workers so SMTP I/O stays off the issue-processing path
+        self._executor = ThreadPoolExecutor(max_workers=self.NOTIFICATION_WORKERS)
 
     def setup_ward_collection(self):
         """ Create the wards collection with sample data if it doesn't exist.
@@ -39,8 +125,10 @@ class WardNotificationSystem:
             - ward_id: unique identifier
             - name: name of the ward
             - officer_email: email of officer responsible
-            - boundaries: array of coordinate objects defining ward polygon
+            - boundaries_x: packed BOUNDARY_DTYPE bytes of the polygon's longitudes
+            - boundaries_y: packed BOUNDARY_DTYPE bytes of the polygon's latitudes
             - area_sq_meters: area covered by the ward
+            The IDs of the created wards are also recorded in the ward index document.
         """
         # Using 'ward' collection name as specified
         wards_ref = self.db.collection('ward')
@@ -76,12 +164,30 @@ class WardNotificationSystem:
                 }
             ]
             
+            import numpy as np
+            
+            # Store boundaries as packed coordinate arrays rather than a list
+            # of {'lat', 'lng'} maps
             for ward in sample_wards:
-                wards_ref.document(ward['ward_id']).set(ward)
+                boundaries = ward.pop('boundaries')
+                ward['boundaries_x'] = np.asarray([b['lng'] for b in boundaries], dtype=BOUNDARY_DTYPE).tobytes()
+                ward['boundaries_y'] = np.asarray([b['lat'] for b in boundaries], dtype=BOUNDARY_DTYPE).tobytes()
             
-            print(f"Created {len(sample_wards)} sample wards in database")
+            # Write all sample wards in a single atomic batch
+            batch = self.db.batch()
+            for ward in sample_wards:
+                batch.set(wards_ref.document(ward['ward_id']), ward)
+            
+            # Record the ward IDs so they can be fetched in one batched get
+            batch.set(self._ward_index_ref(), {
+                'ward_ids': [ward['ward_id'] for ward in sample_wards]
+            })
+            batch.commit()
+            self._ward_index_ids = [ward['ward_id'] for ward in sample_wards]
+            
+            logger.info("Created %d sample wards in database", len(sample_wards))
         else:
-            print("Wards collection already exists")
+            logger.info("Wards collection already exists")
 
     def point_in_polygon(self, lat, long, boundaries):
         """
@@ -95,13 +201,260 @@ class WardNotificationSystem:
         Returns:
             bool: True if point is inside polygon, False otherwise
         """
-        point = Point(lat, long)
+        from shapely.geometry import Point, Polygon
+        
+        # Shapely works in planar (x, y) order, i.e. (lng, lat)
+        point = Point(long, lat)
         # Convert boundaries to the format expected by Shapely
-        polygon_coords = [(b['lat'], b['lng']) for b in boundaries]
+        polygon_coords = [(b['lng'], b['lat']) for b in boundaries]
         polygon = Polygon(polygon_coords)
         
         return polygon.contains(point)
 
+    def _get_wards_cached(self):
+        """
+        Return the list of ward dicts, fetching them from Firestore only when
+        the cache is empty or older than WARD_TTL seconds
+        
+        Returns:
+            list: Ward documents as dicts (with 'id' set to the document ID
+                  and '_contains_fn' holding the ward's generated
+                  point-in-polygon function)
+        """
+        if self._ward_cache is not None and time.time() - self._ward_cache_ts < self.WARD_TTL:
+            return self._ward_cache
+        
+        with self._ward_lock:
+            generation = self._ward_generation
+        
+        # Using 'ward' collection name as specified
+        wards_ref = self.db.collection('ward')
+        # Only fetch the fields the lookup and notification paths need
+        ward_fields = ['ward_id', 'name', 'officer_email', 'boundaries_x', 'boundaries_y', 'boundaries']
+        
+        # Prefer a single batched get of the known ward IDs. The index is
+        # kept up to date by the ward snapshot listener (_on_wards_changed).
+        index_doc = self._ward_index_ref().get()
+        ward_ids = (index_doc.to_dict() or {}).get('ward_ids') if index_doc.exists else None
+        ward_docs = None
+        if ward_ids:
+            self._ward_index_ids = list(ward_ids)
+            refs = [wards_ref.document(ward_id) for ward_id in ward_ids]
+            snapshots = {doc.id: doc for doc in self.db.get_all(refs, field_paths=ward_fields)}
+            # get_all() does not preserve order, so restore the index order
+            if all(ward_id in snapshots and snapshots[ward_id].exists for ward_id in ward_ids):
+                ward_docs = [snapshots[ward_id] for ward_id in ward_ids]
+        
+        if ward_docs is None:
+            # No index, or it lists a ward that no longer exists: read the
+            # whole collection instead
+            ward_docs = wards_ref.select(ward_fields).stream()
+        
+        return self._rebuild_ward_cache(ward_docs, generation)
+
+    def _ward_index_ref(self):
+        """Return the reference to the document listing every ward ID"""
+        return self.db.collection(WARD_INDEX_COLLECTION).document(WARD_INDEX_DOCUMENT)
+
+    def _update_ward_index(self, ward_ids):
+        """
+        Rewrite the ward index document if it does not already list exactly
+        the given ward IDs
+        
+        Args:
+            ward_ids (list): IDs of every ward document, in collection order
+        """
+        if self._ward_index_ids is None:
+            # First check in this process: find out what the index holds
+            index_doc = self._ward_index_ref().get()
+            self._ward_index_ids = (index_doc.to_dict() or {}).get('ward_ids') if index_doc.exists else None
+        
+        if self._ward_index_ids is not None and sorted(self._ward_index_ids) == sorted(ward_ids):
+            return
+        
+        self._ward_index_ref().set({'ward_ids': ward_ids})
+        self._ward_index_ids = ward_ids
+        logger.info("Ward index updated with %d wards", len(ward_ids))
+
+    def _rebuild_ward_cache(self, ward_docs, generation=None):
+        """
+        Replace the ward cache with the given ward documents
+        
+        Args:
+            ward_docs (iterable): Ward DocumentSnapshots
+            generation (int, optional): Cache generation observed before the
+                documents were fetched. If another cache has been installed
+                since, these documents may be older than it and are not
+                installed. None always installs (listener snapshots).
+            
+        Returns:
+            list: The cached list of ward dicts
+        """
+        wards = []
+        for ward_doc in ward_docs:
+            ward = ward_doc.to_dict()
+            ward['id'] = ward_doc.id
+            try:
+                coords = self._boundary_coords(ward)
+                if coords is None:
+                    continue
+                xs, ys = coords
+                ward['_bounds'] = (min(xs), min(ys), max(xs), max(ys))
+                ward['_contains_fn'] = self._compile_contains_fn(xs, ys)
+            except (KeyError, TypeError, ValueError) as e:
+                # One bad ward should not take the whole cache down with it
+                logger.warning("Skipping ward %s with malformed boundaries: %s", ward_doc.id, e)
+                continue
+            wards.append(ward)
+        
+        grid = self._build_ward_grid(wards)
+        
+        with self._ward_lock:
+            if generation is not None and generation != self._ward_generation:
+                # A newer snapshot was installed while these wards were fetched
+                return self._ward_cache if self._ward_cache is not None else wards
+            self._ward_generation += 1
+            self._ward_grid = grid
+            self._ward_cache = wards
+            self._ward_cache_ts = time.time()
+        return wards
+
+    def _on_wards_changed(self, col_snapshot, changes, read_time):
+        """
+        Snapshot listener callback for the ward collection: rebuild the cache
+        from the collection's new state whenever a ward is added, changed or
+        removed
+        
+        Args:
+            col_snapshot (list): Current DocumentSnapshots of the collection
+            changes (list): Document changes since the previous snapshot
+            read_time (datetime): Time the snapshot was read
+        """
+        try:
+            wards = self._rebuild_ward_cache(col_snapshot)
+            logger.info("Ward cache rebuilt with %d wards", len(wards))
+        except Exception as e:
+            logger.error("Error rebuilding ward cache: %s", e)
+            # Drop the cache so the next lookup fetches the wards itself
+            with self._ward_lock:
+                self._ward_cache = None
+        
+        # Keep the ward index in step with the collection's membership
+        if any(change.type.name in ('ADDED', 'REMOVED') for change in changes):
+            try:
+                self._update_ward_index([doc.id for doc in col_snapshot])
+            except Exception as e:
+                logger.error("Error updating ward index: %s", e)
+
+    def _boundary_coords(self, ward):
+        """
+        Extract a ward's polygon vertices, preferring the packed
+        'boundaries_x'/'boundaries_y' arrays and falling back to the legacy
+        'boundaries' list of coordinate objects
+        
+        Args:
+            ward (dict): Ward document
+            
+        Returns:
+            tuple: (xs, ys) lists of longitudes and latitudes, or None if the
+                   ward has no boundaries
+            
+        Raises:
+            ValueError: If the boundaries do not describe a usable polygon
+        """
+        if ward.get('boundaries_x') and ward.get('boundaries_y'):
+            import numpy as np
+            
+            xs = np.frombuffer(ward['boundaries_x'], dtype=BOUNDARY_DTYPE).tolist()
+            ys = np.frombuffer(ward['boundaries_y'], dtype=BOUNDARY_DTYPE).tolist()
+        elif ward.get('boundaries'):
+            xs = [float(b['lng']) for b in ward['boundaries']]
+            ys = [float(b['lat']) for b in ward['boundaries']]
+        else:
+            return None
+        
+        if len(xs) != len(ys):
+            raise ValueError(f"{len(xs)} longitudes but {len(ys)} latitudes")
+        if len(xs) < 3:
+            raise ValueError(f"polygon needs at least 3 vertices, got {len(xs)}")
+        if not all(math.isfinite(v) for v in xs + ys):
+            raise ValueError("non-finite coordinate")
+        if min(xs) == max(xs) or min(ys) == max(ys):
+            raise ValueError("polygon has zero area")
+        
+        return xs, ys
+
+    def _build_ward_grid(self, wards):
+        """
+        Bucket wards into a uniform grid by the cells their bounding boxes
+        overlap, so a lookup only runs the point-in-polygon functions of the
+        wards registered in the point's cell
+        
+        Args:
+            wards (list): Ward dicts with '_bounds' set
+            
+        Returns:
+            tuple: (cell_size, cells) where cells maps (row, col) to the wards
+                   overlapping that cell in cache order, or None if there are
+                   no wards
+        """
+        if not wards:
+            return None
+        
+        # Size cells like a typical ward, but large enough that no single
+        # ward spans more than WARD_GRID_MAX_SPAN cells per axis
+        extents = sorted(max(maxx - minx, maxy - miny) for minx, miny, maxx, maxy in
+                         (ward['_bounds'] for ward in wards))
+        cell_size = max(extents[len(extents) // 2], extents[-1] / self.WARD_GRID_MAX_SPAN)
+        
+        cells = {}
+        for ward in wards:
+            minx, miny, maxx, maxy = ward['_bounds']
+            for row in range(math.floor(miny / cell_size), math.floor(maxy / cell_size) + 1):
+                for col in range(math.floor(minx / cell_size), math.floor(maxx / cell_size) + 1):
+                    cells.setdefault((row, col), []).append(ward)
+        
+        return cell_size, cells
+
+    def _compile_contains_fn(self, xs, ys):
+        """
+        Generate a point-in-polygon function specialized for one ward.
+        Boundaries are fixed once loaded, so the ray-casting loop is unrolled
+        into straight-line comparisons with the vertex coordinates baked in
+        as literals, behind a bounding-box early exit.
+        
+        Args:
+            xs (list): Longitudes of the polygon vertices
+            ys (list): Latitudes of the polygon vertices
+            
+        Returns:
+            function: contains(lat, lng) -> bool
+        """
+        # Work in (x=lng, y=lat) order like the rest of the geometry code
+        coords = [(float(x), float(y)) for x, y in zip(xs, ys)]
+        
+        lines = [
+            "def contains(lat, lng):",
+            f"    if not ({min(ys)!r} <= lat <= {max(ys)!r} and {min(xs)!r} <= lng <= {max(xs)!r}):",
+            "        return False",
+            "    inside = False",
+        ]
+        for i, (x1, y1) in enumerate(coords):
+            x2, y2 = coords[(i + 1) % len(coords)]
+            if y1 == y2:
+                # Horizontal edges never straddle the ray
+                continue
+            slope = (x2 - x1) / (y2 - y1)
+            lines.append(
+                f"    if (lat < {y1!r}) != (lat < {y2!r}) and lng < {x1!r} + (lat - {y1!r}) * {slope!r}:"
+            )
+            lines.append("        inside = not inside")
+        lines.append("    return inside")
+        
+        namespace = {}
+        exec(compile("\n".join(lines), "<ward contains>", "exec"), namespace)
+        return namespace['contains']
+
     def find_ward_for_location(self, lat, long):
         """
         Find the ward for the given coordinates
@@ -113,28 +466,130 @@ class WardNotificationSystem:
         Returns:
             dict: Ward document or None if no ward contains the point
         """
-        # Using 'ward' collection name as specified
-        wards_ref = self.db.collection('ward')
-        wards = list(wards_ref.stream())
+        wards = self._get_wards_cached()
+        grid = self._ward_grid
         
-        if not wards:
-            print("No wards found in database")
+        if not wards or grid is None:
+            logger.warning("No wards found in database")
             return None
         
-        # FIXED: Actually check each ward to see if the point is within its boundaries
-        for ward_doc in wards:
-            ward = ward_doc.to_dict()
-            ward['id'] = ward_doc.id
-            
-            # Check if the issue location is within this ward's boundaries
-            if 'boundaries' in ward and self.point_in_polygon(lat, long, ward['boundaries']):
-                print(f"Found matching ward: {ward['name']} for location ({lat}, {long})")
+        # NaN or infinite coordinates cannot fall inside any ward, and would
+        # not map to a grid cell
+        if not (math.isfinite(lat) and math.isfinite(long)):
+            logger.info("No ward contains the point (%s, %s)", lat, long)
+            return None
+        
+        # Only wards whose bounding box overlaps the point's grid cell can
+        # contain it, so check just those
+        cell_size, cells = grid
+        candidates = cells.get((math.floor(lat / cell_size), math.floor(long / cell_size)), ())
+        for ward in candidates:
+            if ward['_contains_fn'](lat, long):
+                logger.debug("Found matching ward: %s for location (%s, %s)", ward['name'], lat, long)
                 return ward
         
         # If we get here, the point wasn't in any ward
-        print(f"No ward contains the point ({lat}, {long})")
+        logger.info("No ward contains the point (%s, %s)", lat, long)
         return None
 
+    def _get_smtp(self):
+        """
+        Return the calling thread's SMTP session, connecting, upgrading to TLS
+        and logging in only when the thread has no live session. Each worker
+        thread keeps its own session so sends from different workers overlap.
+        
+        Returns:
+            smtplib.SMTP: Authenticated SMTP connection
+        """
+        local = self._smtp_local
+        if getattr(local, 'server', None) is not None and local.sent >= self.SMTP_MAX_MESSAGES:
+            self._close_smtp()
+        
+        if getattr(local, 'server', None) is None:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.SMTP_TIMEOUT)
+            try:
+                server.starttls()
+                server.login(self.email_sender, self.email_password)
+            except Exception:
+                server.close()
+                raise
+            local.server = server
+            local.sent = 0
+            with self._smtp_lock:
+                self._smtp_sessions.add(server)
+        
+        return local.server
+
+    def _close_smtp(self, graceful=True):
+        """
+        Close the calling thread's SMTP session, if it has one
+        
+        Args:
+            graceful (bool): Send QUIT first; pass False for a broken or
+                stalled socket so closing does not wait on it again
+        """
+        server = getattr(self._smtp_local, 'server', None)
+        if server is None:
+            return
+        self._smtp_local.server = None
+        with self._smtp_lock:
+            self._smtp_sessions.discard(server)
+        self._disconnect_smtp(server, graceful)
+
+    def _disconnect_smtp(self, server, graceful=True):
+        """Close an SMTP session, ignoring errors from a dead connection"""
+        try:
+            if graceful:
+                server.quit()
+        except OSError:
+            pass
+        finally:
+            server.close()
+
+    def _send_message(self, msg):
+        """
+        Send a message over the calling thread's SMTP session, reconnecting
+        once if the server has dropped it
+        
+        Args:
+            msg (Message): Email message to send
+        """
+        for attempt in range(2):
+            try:
+                self._get_smtp().send_message(msg)
+                self._smtp_local.sent += 1
+                return
+            except smtplib.SMTPServerDisconnected:
+                # The server dropped the idle session; reconnect once and retry
+                self._close_smtp(graceful=False)
+                if attempt:
+                    raise
+            except smtplib.SMTPException:
+                # Rejected by the server, but the session itself is still usable
+                raise
+            except OSError:
+                # Timed out or broken socket: drop the session so the next
+                # send starts a fresh one
+                self._close_smtp(graceful=False)
+                raise
+
+    def close(self):
+        """
+        Stop watching the ward collection, wait for pending notifications to
+        finish, then stop the background workers and close every SMTP session
+        """
+        if self._ward_watch is not None:
+            self._ward_watch.unsubscribe()
+            self._ward_watch = None
+        
+        self._executor.shutdown(wait=True)
+        
+        with self._smtp_lock:
+            sessions = list(self._smtp_sessions)
+            self._smtp_sessions.clear()
+        for server in sessions:
+            self._disconnect_smtp(server)
+
     def send_email_notification(self, officer_email, issue_data, ward_data):
         """
         Send email notification to ward officer
@@ -151,62 +606,62 @@ class WardNotificationSystem:
             msg['Subject'] = f"New Issue Reported in {ward_data['name']} - {issue_data['category']}"
             
             # Format the email body
-            body = f"""
-            <html>
-            <body>
-                <h2>New Issue Reported in Your Ward</h2>
-                <p><strong>Ward:</strong> {ward_data['name']} (ID: {ward_data['ward_id']})</p>
-                <p><strong>Category:</strong> {issue_data['category']}</p>
-                <p><strong>Description:</strong> {issue_data['description']}</p>
-                <p><strong>Location:</strong> {issue_data['latitude']}, {issue_data['longitude']}</p>
-                <p><strong>Reported on:</strong> {issue_data['created_at'].strftime('%Y-%m-%d %H:%M:%S')}</p>
-                <p><strong>Issue ID:</strong> {issue_data['id']}</p>
-                <p>Please check the admin dashboard for more details.</p>
-            </body>
-            </html>
-            """
+            body = _EMAIL_TEMPLATE.format(
+                ward_name=ward_data['name'],
+                ward_id=ward_data['ward_id'],
+                category=issue_data['category'],
+                description=issue_data['description'],
+                latitude=issue_data['latitude'],
+                longitude=issue_data['longitude'],
+                created_at=issue_data['created_at'].strftime('%Y-%m-%d %H:%M:%S'),
+                issue_id=issue_data['id']
+            )
             
             msg.attach(MIMEText(body, 'html'))
             
-            # FIXED: Added debug print to verify email credentials
-            print(f"Attempting to send email using: {self.smtp_server}:{self.smtp_port}")
-            print(f"Sender: {self.email_sender}")
-            print(f"Recipient: {officer_email}")
+            logger.debug(
+                "Attempting to send email using: %s:%s (sender: %s, recipient: %s)",
+                self.smtp_server, self.smtp_port, self.email_sender, officer_email
+            )
+            
+            # Reuse this thread's SMTP session instead of a new TLS handshake per email
+            self._send_message(msg)
             
-            # Connect to SMTP server and send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.email_sender, self.email_password)
-                server.send_message(msg)
-                
-            print(f"Email notification sent to {officer_email}")
+            logger.info("Email notification sent to %s", officer_email)
             return True
         
         except Exception as e:
-            print(f"Failed to send email: {str(e)}")
+            logger.error("Failed to send email: %s", e)
             return False
 
-    def process_new_issue(self, issue_id):
+    def process_new_issue(self, issue_id, issue_data=None):
         """
         Process a newly created issue to send notifications
         
         Args:
             issue_id (str): ID of the newly created issue
+            issue_data (dict, optional): Issue fields already known to the caller
+                (e.g. a trigger's snapshot data). When omitted, the issue is
+                read from Firestore.
         """
         try:
-            # Get issue data
             issue_ref = self.db.collection('issues').document(issue_id)
-            issue_doc = issue_ref.get()
             
-            if not issue_doc.exists:
-                print(f"Issue {issue_id} not found")
-                return False
+            if issue_data is None:
+                # Get issue data
+                issue_doc = issue_ref.get()
+                
+                if not issue_doc.exists:
+                    logger.warning("Issue %s not found", issue_id)
+                    return False
+                
+                issue_data = issue_doc.to_dict()
+            else:
+                issue_data = dict(issue_data)
             
-            issue_data = issue_doc.to_dict()
             issue_data['id'] = issue_id
             
-            # FIXED: Added debug print to verify coordinates
-            print(f"Processing issue at location: {issue_data['latitude']}, {issue_data['longitude']}")
+            logger.debug("Processing issue at location: %s, %s", issue_data['latitude'], issue_data['longitude'])
             
             # Find ward for issue location
             ward = self.find_ward_for_location(
@@ -215,23 +670,54 @@ class WardNotificationSystem:
             )
             
             if not ward:
-                print(f"No ward found for location: {issue_data['latitude']}, {issue_data['longitude']}")
-                # Update the issue with no assigned ward
-                issue_ref.update({
-                    'ward_assigned': False,
-                    'notification_sent': False
-                })
+                logger.info("No ward found for location: %s, %s", issue_data['latitude'], issue_data['longitude'])
+                # Update the issue with no assigned ward, unless it already says so
+                if issue_data.get('ward_assigned') is not False or issue_data.get('notification_sent') is not False:
+                    issue_ref.update({
+                        'ward_assigned': False,
+                        'notification_sent': False
+                    })
                 return False
             
-            # Update issue with ward info
+            # Skip reprocessed issues whose officer was already notified, so
+            # neither the email nor the Firestore write is repeated
+            if issue_data.get('notification_sent') and issue_data.get('ward_id') == ward['ward_id']:
+                logger.debug("Issue %s already notified for ward %s", issue_id, ward['ward_id'])
+                return True
+            
+            # Update issue with ward info before handing off the email, so the
+            # assignment is saved even if the background send never completes
             issue_ref.update({
                 'ward_id': ward['ward_id'],
                 'ward_name': ward['name'],
                 'ward_assigned': True
             })
             
-            # Send email notification
-            email_sent = self.send_email_notification(ward['officer_email'], issue_data, ward)
+            # Send email notification in the background; its status is
+            # written back to the issue once the send completes
+            future = self._executor.submit(
+                self.send_email_notification, ward['officer_email'], issue_data, ward
+            )
+            future.add_done_callback(partial(self._on_notification_done, issue_ref))
+            
+            return True
+            
+        except Exception as e:
+            logger.error("Error processing issue %s: %s", issue_id, e)
+            return False
+
+    def _on_notification_done(self, issue_ref, future):
+        """
+        Record the result of a background email send on the issue
+        
+        Args:
+            issue_ref (DocumentReference): Reference to the issue document
+            future (Future): Completed send_email_notification future
+        """
+        from firebase_admin import firestore
+        
+        try:
+            email_sent = future.result()
             
             # Update issue with notification status
             issue_ref.update({
@@ -239,12 +725,8 @@ class WardNotificationSystem:
                 'notification_email_sent': email_sent,
                 'notification_time': firestore.SERVER_TIMESTAMP
             })
-            
-            return True
-            
         except Exception as e:
-            print(f"Error processing issue {issue_id}: {str(e)}")
-            return False
+            logger.error("Error updating notification status for issue %s: %s", issue_ref.id, e)
 
     def setup_firestore_trigger(self):
         """
@@ -254,8 +736,9 @@ class WardNotificationSystem:
         For a complete solution, you would:
         1. Create a Cloud Function in Firebase that triggers on issue creation
         2. The function would call process_new_issue() with the new issue ID
+           and, ideally, the snapshot data so the issue is not read again
         """
-        print("""
+        logger.info("""
         ----------------------------------------------------------------
         To implement the Firestore trigger in a real application:
         
@@ -308,36 +791,45 @@ class WardNotificationSystem:
         issue_ref.set(issue_data)
         issue_id = issue_ref.id
         
-        print(f"Created sample issue with ID: {issue_id}")
+        logger.info("Created sample issue with ID: %s", issue_id)
         
-        # Process the issue
-        result = self.process_new_issue(issue_id)
+        # Process the issue, reusing the data we just wrote instead of re-reading it
+        result = self.process_new_issue(issue_id, issue_data)
         if result:
-            print("Issue processed successfully!")
+            logger.info("Issue processed successfully!")
         else:
-            print("Failed to process issue.")
+            logger.error("Failed to process issue.")
 
 def main():
+    # Show informational output when run as a script; library users keep the
+    # default WARNING level
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Initialize the ward notification system
     system = WardNotificationSystem()
     
     # FIXED: Check if email credentials are properly set
     if not system.email_sender or not system.email_password:
-        print("ERROR: Email credentials not set. Please check your .env file.")
-        print(f"Found email_sender: {system.email_sender}")
-        print(f"Email password exists: {'Yes' if system.email_password else 'No'}")
+        logger.error("ERROR: Email credentials not set. Please check your .env file.")
+        logger.error("Found email_sender: %s", system.email_sender)
+        logger.error("Email password exists: %s", 'Yes' if system.email_password else 'No')
+        system.close()
         return
     
-    # Setup the wards collection if it doesn't exist
-    system.setup_ward_collection()
-    
-    # Explain how to set up the trigger
-    system.setup_firestore_trigger()
-    
-    # For testing, process a sample issue
-    system.test_with_sample_issue()
+    try:
+        # Setup the wards collection if it doesn't exist
+        system.setup_ward_collection()
+        
+        # Explain how to set up the trigger
+        system.setup_firestore_trigger()
+        
+        # For testing, process a sample issue
+        system.test_with_sample_issue()
+    finally:
+        # Let the background notification finish before exiting
+        system.close()
     
-    print("Ward notification system is ready!")
+    logger.info("Ward notification system is ready!")
 
 if __name__ == "__main__":
     main()